@@ -0,0 +1,208 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import cv2
+from utils.file_utils import ensure_directory
+from utils.config import (
+    IMAGE_FORMAT, PNG_COMPRESSION, JPEG_QUALITY, WEBP_QUALITY,
+    IMAGE_DECIMATION, IMAGE_WRITER_WORKERS, IMAGE_WRITER_MAX_PENDING
+)
+
+IMAGE_EXTENSIONS = {
+    'png': '.png',
+    'jpg': '.jpg',
+    'jpeg': '.jpg',
+    'webp': '.webp'
+}
+
+def get_encode_params(image_format, png_compression=PNG_COMPRESSION, jpeg_quality=JPEG_QUALITY, webp_quality=WEBP_QUALITY):
+    """
+    Get the file extension and OpenCV encoding parameters for an image format.
+
+    Args:
+        image_format (str): One of 'png', 'jpg', 'jpeg' or 'webp'.
+        png_compression (int): PNG compression level (0-9).
+        jpeg_quality (int): JPEG quality (0-100).
+        webp_quality (int): WebP quality (1-100).
+
+    Returns:
+        tuple: File extension and list of OpenCV imwrite parameters.
+    """
+    image_format = image_format.lower()
+    if image_format not in IMAGE_EXTENSIONS:
+        raise ValueError(f"Unsupported image format: {image_format}")
+
+    if image_format == 'png':
+        params = [cv2.IMWRITE_PNG_COMPRESSION, int(png_compression)]
+    elif image_format == 'webp':
+        params = [cv2.IMWRITE_WEBP_QUALITY, int(webp_quality)]
+    else:
+        params = [cv2.IMWRITE_JPEG_QUALITY, int(jpeg_quality)]
+    return IMAGE_EXTENSIONS[image_format], params
+
+def write_image(output_path, image_bgr, params):
+    """
+    Encode an image in memory and write it to disk.
+
+    Args:
+        output_path (str): Path to save the image; the extension selects the encoder.
+        image_bgr (numpy.ndarray): Image in BGR format.
+        params (list): OpenCV imwrite parameters.
+    """
+    ok, buffer = cv2.imencode(os.path.splitext(output_path)[1], image_bgr, params)
+    if not ok:
+        raise IOError(f"Failed to encode image: {output_path}")
+    with open(output_path, 'wb') as f:
+        f.write(buffer.tobytes())
+
+def clear_frames(directory):
+    """
+    Delete previously written frame images from a directory.
+
+    Args:
+        directory (str): Directory containing frame_* images.
+    """
+    extensions = tuple(set(IMAGE_EXTENSIONS.values()))
+    stale = [name for name in os.listdir(directory) if name.startswith('frame_') and name.endswith(extensions)]
+    for name in stale:
+        os.remove(os.path.join(directory, name))
+    if stale:
+        print(f"[Image Writer] Removed {len(stale)} old frames from: {directory}")
+
+class ImageWriter:
+    """
+    Encode and write in-memory frames on a bounded background thread pool.
+
+    Submitting blocks once max_pending images are queued, so a slow disk
+    throttles the processing loop instead of growing memory without bound.
+    """
+
+    def __init__(self, output_dirs, image_format=IMAGE_FORMAT, png_compression=PNG_COMPRESSION,
+                 jpeg_quality=JPEG_QUALITY, webp_quality=WEBP_QUALITY, decimation=None,
+                 max_workers=IMAGE_WRITER_WORKERS, max_pending=IMAGE_WRITER_MAX_PENDING):
+        """
+        Args:
+            output_dirs (dict): Output directory per image kind ('2d', '3d', 'comparison').
+            image_format (str): One of 'png', 'jpg', 'jpeg' or 'webp'.
+            png_compression (int): PNG compression level (0-9).
+            jpeg_quality (int): JPEG quality (0-100).
+            webp_quality (int): WebP quality (1-100).
+            decimation (dict): Write only every Nth frame per image kind; defaults to IMAGE_DECIMATION.
+            max_workers (int): Number of background writer threads.
+            max_pending (int): Maximum number of queued images before submit blocks.
+        """
+        self.output_dirs = output_dirs
+        self.extension, self.params = get_encode_params(image_format, png_compression, jpeg_quality, webp_quality)
+        self.decimation = dict(IMAGE_DECIMATION if decimation is None else decimation)
+        for kind, step in self.decimation.items():
+            if int(step) < 1:
+                raise ValueError(f"Decimation for '{kind}' must be at least 1, got {step}")
+
+        # Remove frames of earlier runs, which may use another format or decimation
+        for directory in output_dirs.values():
+            ensure_directory(directory)
+            clear_frames(directory)
+
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='image_writer')
+        self._slots = threading.BoundedSemaphore(max(1, max_pending))
+        self._lock = threading.Lock()
+        self._errors = []
+        self._written = 0
+        self._closed = False
+        print(f"[Image Writer] Format: {self.extension}, Workers: {max_workers}, Max pending: {max_pending}, Decimation: {self.decimation}")
+
+    def should_write(self, kind, frame_number):
+        """
+        Check whether an image of the given kind should be written for a frame.
+
+        Args:
+            kind (str): Image kind ('2d', '3d', 'comparison').
+            frame_number (int): 1-based frame number.
+
+        Returns:
+            bool: True if the frame is kept after decimation.
+
+        Raises:
+            ValueError: If the kind has no output directory.
+        """
+        self._check_kind(kind)
+        step = int(self.decimation.get(kind, 1))
+        return (frame_number - 1) % step == 0
+
+    def get_fps(self, kind, fps):
+        """
+        Get the effective frame rate of the written images of a kind.
+
+        Args:
+            kind (str): Image kind ('2d', '3d', 'comparison').
+            fps (float): Frame rate of the source video.
+
+        Returns:
+            float: Source frame rate divided by the decimation step.
+        """
+        return fps / int(self.decimation.get(kind, 1))
+
+    def submit(self, kind, frame_number, image_bgr):
+        """
+        Queue an image for encoding and writing, blocking while the queue is full.
+
+        Args:
+            kind (str): Image kind ('2d', '3d', 'comparison').
+            frame_number (int): Frame number for naming the output file.
+            image_bgr (numpy.ndarray): Image in BGR format. It must not be modified after submitting.
+        """
+        if self._closed:
+            raise RuntimeError("ImageWriter is closed")
+        self._check_kind(kind)
+        self._raise_errors()
+
+        output_path = os.path.join(self.output_dirs[kind], f'frame_{frame_number:06d}{self.extension}')
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(write_image, output_path, image_bgr, self.params)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(self._on_done)
+
+    def _check_kind(self, kind):
+        if kind not in self.output_dirs:
+            raise ValueError(f"Unknown image kind '{kind}', configured kinds: {sorted(self.output_dirs)}")
+
+    def _on_done(self, future):
+        self._slots.release()
+        error = future.exception()
+        with self._lock:
+            if error is not None:
+                self._errors.append(error)
+            else:
+                self._written += 1
+
+    def _raise_errors(self):
+        with self._lock:
+            if self._errors:
+                raise self._errors[0]
+
+    def close(self, raise_errors=True):
+        """
+        Wait for all queued images to be written and shut down the thread pool.
+
+        Args:
+            raise_errors (bool): Raise the first error encountered by a background write, if any.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        print("[Image Writer] Flushing pending images...")
+        self._executor.shutdown(wait=True)
+        print(f"[Image Writer] Wrote {self._written} images")
+        if raise_errors:
+            self._raise_errors()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # Do not mask an exception already propagating out of the with block
+        self.close(raise_errors=exc_type is None)
+        return False
@@ -3,16 +3,19 @@ import os
 from utils.file_utils import ensure_directory
 from utils.config import MODEL_TYPE, SERVER_PREFIX, CACHE_DIR
 
-def download_model():
+def download_model(model_type=MODEL_TYPE):
     """
     Download and load the Metrabs model from the specified URL.
     
+    Args:
+        model_type (str): Metrabs model variant to download.
+    
     Returns:
         str: Path to the downloaded model.
     """
-    print(f"[Model Loader] Loading Metrabs model: {MODEL_TYPE}")
+    print(f"[Model Loader] Loading Metrabs model: {model_type}")
     
-    model_path = os.path.join(CACHE_DIR, MODEL_TYPE)
+    model_path = os.path.join(CACHE_DIR, model_type)
     
     # Check if model directory exists
     if os.path.exists(model_path):
@@ -24,10 +27,10 @@ def download_model():
     print(f"[Model Loader] Cache directory ensured: {CACHE_DIR}")
     
     # Download and extract model
-    print(f"[Model Loader] Downloading model from: {SERVER_PREFIX}/{MODEL_TYPE}_20211019.zip")
+    print(f"[Model Loader] Downloading model from: {SERVER_PREFIX}/{model_type}_20211019.zip")
     model_zippath = tf.keras.utils.get_file(
-        origin=f'{SERVER_PREFIX}/{MODEL_TYPE}_20211019.zip',
+        origin=f'{SERVER_PREFIX}/{model_type}_20211019.zip',
         extract=True, cache_subdir='models')
-    model_path = os.path.join(os.path.dirname(model_zippath), MODEL_TYPE)
+    model_path = os.path.join(os.path.dirname(model_zippath), model_type)
     print(f"[Model Loader] Model downloaded and extracted to: {model_path}")
     return model_path
\ No newline at end of file
@@ -0,0 +1,616 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+import cv2
+import numpy as np
+from src.aspect_ratio import check_and_adjust_aspect_ratio
+from utils.file_utils import ensure_directory
+from utils.config import (
+    SMPL24_JOINT_NAMES, BENCHMARK_REFERENCE_CONFIG, BENCHMARK_CANDIDATE_CONFIGS,
+    BENCHMARK_MAX_MPJPE, BENCHMARK_MAX_JITTER_RATIO, BENCHMARK_MIN_FPS, BENCHMARK_MIN_REFERENCE_JITTER
+)
+
+STUB_MODEL_TYPE = 'stub'
+
+class StubModel:
+    """
+    Deterministic stand-in for a Metrabs model, for running the harness offline.
+
+    Poses are a skeleton template shifted by the image brightness and intensity
+    centroid. Each joint is also scaled about the pelvis by its own gain times the
+    image's edge density, which changes with input resolution, so joints differ in
+    error and root-relative error is non-zero. Estimating from a box adds a shift
+    and extra per-joint scaling proportional to the box's offset from the detected
+    person, standing in for crop error.
+    """
+
+    def __init__(self, seed=0):
+        """
+        Args:
+            seed (int): Seed for the skeleton template.
+        """
+        rng = np.random.default_rng(seed)
+        self.template = rng.uniform(-400, 400, size=(len(SMPL24_JOINT_NAMES), 3)).astype(np.float32)
+        self.template -= self.template[0]
+        self.joint_gain = rng.uniform(0.0, 1.0, size=(len(SMPL24_JOINT_NAMES), 1)).astype(np.float32)
+
+    def _predict(self, image, box=None):
+        gray = np.asarray(image, dtype=np.float32).mean(axis=-1)
+        height, width = gray.shape
+        brightness = gray.mean() / 255.0
+        total = gray.sum() + 1e-6
+        cx = (gray.sum(axis=0) * np.arange(width)).sum() / total / width
+        cy = (gray.sum(axis=1) * np.arange(height)).sum() / total / height
+
+        # Mean absolute horizontal gradient per pixel, which depends on the input resolution
+        edge_density = np.abs(np.diff(gray, axis=1)).mean() / 255.0 if width > 1 else 0.0
+        deformation = edge_density
+        offset = np.array([(cx - 0.5) * 1000, (cy - 0.5) * 1000, 3000 + brightness * 500], dtype=np.float32)
+        if box is not None:
+            box_dx = (box[0] + box[2] / 2) / width - cx
+            box_dy = (box[1] + box[3] / 2) / height - cy
+            offset += np.array([box_dx * 50, box_dy * 50, 0], dtype=np.float32)
+            deformation += np.hypot(box_dx, box_dy) * 0.1
+        pose3d = self.template * (1 + self.joint_gain * deformation) + offset
+        pose2d = np.stack([cx * width + self.template[:, 0] * width / 4000,
+                           cy * height + self.template[:, 1] * height / 4000], axis=-1).astype(np.float32)
+        box_out = np.array([cx * width - width / 8, cy * height - height / 4, width / 4, height / 2, 1.0], dtype=np.float32)
+        return pose3d, pose2d, box_out
+
+    def detect_poses(self, image, max_detections=1, skeleton='smpl_24'):
+        pose3d, pose2d, box = self._predict(image)
+        return {'boxes': box[np.newaxis], 'poses3d': pose3d[np.newaxis], 'poses2d': pose2d[np.newaxis]}
+
+    def estimate_poses(self, image, boxes, skeleton='smpl_24'):
+        results = [self._predict(image, box) for box in np.asarray(boxes)]
+        return {'poses3d': np.stack([r[0] for r in results]), 'poses2d': np.stack([r[1] for r in results])}
+
+    def detect_poses_batched(self, images, max_detections=1, skeleton='smpl_24'):
+        preds = [self.detect_poses(image, max_detections, skeleton) for image in images]
+        return {key: [pred[key] for pred in preds] for key in preds[0]}
+
+def load_model(model_type):
+    """
+    Load a Metrabs model variant, or the stub model.
+
+    Args:
+        model_type (str): Metrabs model variant, or 'stub' for the deterministic stub model.
+
+    Returns:
+        Loaded model.
+    """
+    if model_type == STUB_MODEL_TYPE:
+        print("[Speed Accuracy] Using deterministic stub model")
+        return StubModel()
+
+    # Imported here so the harness runs without TensorFlow when only the stub is used
+    import tensorflow as tf
+    from src.model_loader import download_model
+    print(f"[Speed Accuracy] Loading Metrabs model: {model_type}")
+    return tf.saved_model.load(download_model(model_type))
+
+def resolve_config(config, base=None):
+    """
+    Fill in unspecified pipeline settings of a configuration from a base configuration.
+
+    Args:
+        config (dict): Partial configuration; must contain 'name' when a base is given.
+        base (dict): Resolved configuration to inherit from; defaults to BENCHMARK_REFERENCE_CONFIG.
+            Candidates pass the resolved reference so they differ from it only in what they set.
+
+    Returns:
+        dict: Complete configuration.
+    """
+    if base is not None and not config.get('name'):
+        raise ValueError(f"[Speed Accuracy] Candidate config {config} has no 'name'")
+    resolved = {key: value for key, value in (base or BENCHMARK_REFERENCE_CONFIG).items() if key in BENCHMARK_REFERENCE_CONFIG}
+    resolved.update(config)
+    for key in ['frame_stride', 'batch_size', 'redetect_interval']:
+        if int(resolved[key]) < 1:
+            raise ValueError(f"[Speed Accuracy] {key} must be at least 1 in config '{resolved['name']}'")
+    if resolved['input_scale'] <= 0:
+        raise ValueError(f"[Speed Accuracy] input_scale must be positive in config '{resolved['name']}'")
+    if resolved['batch_size'] > 1 and resolved['redetect_interval'] > 1:
+        raise ValueError(f"[Speed Accuracy] Config '{resolved['name']}' cannot combine batching with tracking crops")
+    return resolved
+
+def _to_numpy(value):
+    return value.numpy() if hasattr(value, 'numpy') else np.asarray(value)
+
+def _box_from_pose2d(pose2d, image_shape, margin=0.2):
+    """
+    Compute a tracking box around 2D joints, enlarged by a margin and clipped to the image.
+    """
+    height, width = image_shape[:2]
+    x_min, y_min = pose2d.min(axis=0)
+    x_max, y_max = pose2d.max(axis=0)
+    pad_x = (x_max - x_min) * margin
+    pad_y = (y_max - y_min) * margin
+    x0, y0 = max(0.0, x_min - pad_x), max(0.0, y_min - pad_y)
+    x1, y1 = min(float(width), x_max + pad_x), min(float(height), y_max + pad_y)
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return np.array([x0, y0, x1 - x0, y1 - y0], dtype=np.float32)
+
+def warm_up_model(model, image, batch_size, use_boxes):
+    """
+    Make untimed model calls with the input shapes of a run, so tracing is not timed.
+
+    Args:
+        model: Loaded Metrabs or stub model.
+        image (numpy.ndarray): Prepared RGB frame at the run's input scale.
+        batch_size (int): Batch size of the run.
+        use_boxes (bool): Whether the run also estimates poses from tracking boxes.
+    """
+    if batch_size > 1:
+        model.detect_poses_batched(np.stack([image] * batch_size), max_detections=1, skeleton='smpl_24')
+        return
+    pred = model.detect_poses(image, max_detections=1, skeleton='smpl_24')
+    if use_boxes:
+        poses2d = _to_numpy(pred['poses2d'])
+        box = _box_from_pose2d(poses2d[0], image.shape) if len(poses2d) else None
+        if box is None:
+            box = np.array([0, 0, image.shape[1], image.shape[0]], dtype=np.float32)
+        model.estimate_poses(image, boxes=box[np.newaxis], skeleton='smpl_24')
+
+def interpolate_skipped_frames(poses, computed):
+    """
+    Linearly interpolate poses of frames that were not run through the model.
+
+    Args:
+        poses (numpy.ndarray): Poses of shape (T, 24, 3), NaN where not available.
+        computed (numpy.ndarray): Boolean mask of frames run through the model.
+
+    Returns:
+        numpy.ndarray: Poses with skipped frames filled in; failed detections stay NaN.
+    """
+    poses = poses.copy()
+    valid = computed & ~np.isnan(poses).any(axis=(1, 2))
+    if not valid.any():
+        return poses
+    frames = np.arange(len(poses))
+    flat = poses.reshape(len(poses), -1)
+    for i in range(flat.shape[1]):
+        flat[~computed, i] = np.interp(frames[~computed], frames[valid], flat[valid, i])
+    return flat.reshape(poses.shape)
+
+def extract_trajectory(video_path, model, config):
+    """
+    Run pose estimation over a video with the given pipeline configuration.
+
+    Args:
+        video_path (str): Path to the input video.
+        model: Loaded Metrabs or stub model.
+        config (dict): Resolved pipeline configuration.
+
+    An untimed warm-up call is made for each input shape the run will use, so model
+    tracing is not counted in the frames per second. The next frame is grabbed before
+    a frame is skipped, so the last frame is always run through the model and skipped
+    frames at the end are interpolated, not held.
+
+    Returns:
+        tuple: Poses of shape (T, 24, 3) for the first person, processing frames per second,
+            and the number of model calls.
+    """
+    stride = int(config['frame_stride'])
+    batch_size = int(config['batch_size'])
+    redetect_interval = int(config['redetect_interval'])
+    scale = float(config['input_scale'])
+    nan_pose = np.full((len(SMPL24_JOINT_NAMES), 3), np.nan, dtype=np.float32)
+
+    def prepare_image(frame):
+        if scale != 1.0:
+            frame = cv2.resize(frame, (max(1, round(frame.shape[1] * scale)), max(1, round(frame.shape[0] * scale))),
+                               interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise IOError(f"[Speed Accuracy] Cannot open video file {video_path}")
+    ret, frame = cap.read()
+    cap.release()
+    if not ret:
+        raise IOError(f"[Speed Accuracy] No frames read from {video_path}")
+    warm_up_model(model, prepare_image(frame), batch_size, redetect_interval > 1)
+
+    cap = cv2.VideoCapture(video_path)
+
+    poses = []
+    computed = []
+    pending = []
+    box = None
+    inferred = 0
+    model_calls = 0
+
+    def run_batch():
+        # Pad a partial last batch so every call has the warmed-up batch shape
+        images = [image for _, image in pending]
+        images += [images[-1]] * (batch_size - len(images))
+        pred = model.detect_poses_batched(np.stack(images), max_detections=1, skeleton='smpl_24')
+        for i, (index, _) in enumerate(pending):
+            poses3d = _to_numpy(pred['poses3d'][i])
+            if len(poses3d):
+                poses[index] = poses3d[0]
+        pending.clear()
+
+    start = time.perf_counter()
+    frame_index = 0
+    has_frame = cap.grab()
+    while has_frame:
+        ret, frame = cap.retrieve()
+        if not ret:
+            break
+        # Read ahead so the last frame is known without trusting the container's frame count
+        has_frame = cap.grab()
+        if frame_index % stride != 0 and has_frame:
+            poses.append(nan_pose)
+            computed.append(False)
+            frame_index += 1
+            continue
+
+        image = prepare_image(frame)
+        poses.append(nan_pose)
+        computed.append(True)
+
+        if batch_size > 1:
+            pending.append((frame_index, image))
+            if len(pending) == batch_size:
+                run_batch()
+                model_calls += 1
+        else:
+            if box is None or inferred % redetect_interval == 0:
+                pred = model.detect_poses(image, max_detections=1, skeleton='smpl_24')
+            else:
+                pred = model.estimate_poses(image, boxes=box[np.newaxis], skeleton='smpl_24')
+            inferred += 1
+            model_calls += 1
+            poses3d = _to_numpy(pred['poses3d'])
+            poses2d = _to_numpy(pred['poses2d'])
+            if len(poses3d):
+                poses[frame_index] = poses3d[0]
+                box = _box_from_pose2d(poses2d[0], image.shape) if redetect_interval > 1 else None
+            else:
+                box = None
+        frame_index += 1
+
+    if pending:
+        run_batch()
+        model_calls += 1
+    elapsed = time.perf_counter() - start
+    cap.release()
+
+    if not poses:
+        raise IOError(f"[Speed Accuracy] No frames read from {video_path}")
+    trajectory = interpolate_skipped_frames(np.stack(poses).astype(np.float64), np.array(computed))
+    fps = len(poses) / elapsed if elapsed > 0 else float('inf')
+    return trajectory, fps, model_calls
+
+def compute_jitter(poses):
+    """
+    Compute temporal jitter as the mean joint acceleration magnitude.
+
+    Args:
+        poses (numpy.ndarray): Poses of shape (T, 24, 3) in millimeters.
+
+    Returns:
+        float: Mean norm of the second temporal difference in mm/frame^2, NaN if undefined.
+    """
+    if len(poses) < 3:
+        return float('nan')
+    acceleration = poses[2:] - 2 * poses[1:-1] + poses[:-2]
+    magnitudes = np.linalg.norm(acceleration, axis=-1)
+    if np.isnan(magnitudes).all():
+        return float('nan')
+    return float(np.nanmean(magnitudes))
+
+def compute_metrics(reference, candidate):
+    """
+    Compare a candidate trajectory against the reference trajectory.
+
+    Args:
+        reference (numpy.ndarray): Reference poses of shape (T, 24, 3).
+        candidate (numpy.ndarray): Candidate poses of shape (T, 24, 3).
+
+    Returns:
+        dict: MPJPE, root-relative MPJPE and per-joint error in mm, jitter of both
+            trajectories and their ratio, and frame counts. The ratio is NaN if the
+            reference jitter is below BENCHMARK_MIN_REFERENCE_JITTER or undefined.
+    """
+    num_frames = min(len(reference), len(candidate))
+    if len(reference) != len(candidate):
+        print(f"[Speed Accuracy] Warning: frame count mismatch ({len(reference)} vs {len(candidate)}), comparing first {num_frames}")
+    reference = reference[:num_frames]
+    candidate = candidate[:num_frames]
+    valid = ~np.isnan(reference).any(axis=(1, 2)) & ~np.isnan(candidate).any(axis=(1, 2))
+
+    metrics = {
+        'frames': int(num_frames),
+        'compared_frames': int(valid.sum()),
+        'mpjpe': float('nan'),
+        'root_relative_mpjpe': float('nan'),
+        'per_joint_error': {joint: float('nan') for joint in SMPL24_JOINT_NAMES},
+        'reference_jitter': compute_jitter(reference),
+        'jitter': compute_jitter(candidate)
+    }
+    if valid.any():
+        errors = np.linalg.norm(candidate[valid] - reference[valid], axis=-1)
+        root_relative = (candidate[valid] - candidate[valid][:, :1]) - (reference[valid] - reference[valid][:, :1])
+        metrics['mpjpe'] = float(errors.mean())
+        metrics['root_relative_mpjpe'] = float(np.linalg.norm(root_relative, axis=-1).mean())
+        metrics['per_joint_error'] = dict(zip(SMPL24_JOINT_NAMES, errors.mean(axis=0).astype(float).tolist()))
+    # A ratio against a (near) static reference is meaningless, so it is left undefined
+    if metrics['reference_jitter'] >= BENCHMARK_MIN_REFERENCE_JITTER:
+        metrics['jitter_ratio'] = metrics['jitter'] / metrics['reference_jitter']
+    else:
+        metrics['jitter_ratio'] = float('nan')
+    return metrics
+
+def check_thresholds(result, config, defaults):
+    """
+    Check a candidate result against the thresholds of its configuration.
+
+    Args:
+        result (dict): Result row with metrics and fps.
+        config (dict): Candidate configuration, optionally with max_mpjpe, max_jitter_ratio and min_fps.
+        defaults (dict): Thresholds used when the configuration does not set its own.
+
+    The jitter check is skipped when the jitter ratio is undefined.
+
+    Returns:
+        list: Descriptions of failed checks; empty if all passed.
+    """
+    limits = {key: config.get(key, defaults.get(key)) for key in ['max_mpjpe', 'max_jitter_ratio', 'min_fps']}
+    failures = []
+    if limits['max_mpjpe'] is not None and not result['mpjpe'] <= limits['max_mpjpe']:
+        failures.append(f"MPJPE {result['mpjpe']:.2f} mm > {limits['max_mpjpe']} mm")
+    if (limits['max_jitter_ratio'] is not None and np.isfinite(result['jitter_ratio'])
+            and result['jitter_ratio'] > limits['max_jitter_ratio']):
+        failures.append(f"jitter ratio {result['jitter_ratio']:.2f} > {limits['max_jitter_ratio']}")
+    if limits['min_fps'] is not None and not result['fps'] >= limits['min_fps']:
+        failures.append(f"FPS {result['fps']:.2f} < {limits['min_fps']}")
+    return failures
+
+def _pipeline_settings(config):
+    return {key: config[key] for key in BENCHMARK_REFERENCE_CONFIG if key != 'name'}
+
+def _clip_identity(video_path):
+    stat = os.stat(video_path)
+    return {'path': os.path.abspath(video_path), 'size': stat.st_size, 'mtime': stat.st_mtime}
+
+def load_or_run_reference(video_path, processed_video_path, config, get_model, cache_dir):
+    """
+    Load the cached reference trajectory of a clip, or run the reference configuration and cache it.
+
+    The cache is reused only if it was produced from the same source file (absolute path, size
+    and modification time) with the same pipeline settings. The cached frames per second come
+    from the run that filled the cache, possibly on another machine, so they are flagged.
+
+    Args:
+        video_path (str): Path to the source video, used to identify the cache entry.
+        processed_video_path (str): Path to the aspect-ratio adjusted video to run.
+        config (dict): Resolved reference configuration.
+        get_model (callable): Returns the loaded model for a model type.
+        cache_dir (str): Directory for cached reference trajectories, or None to disable caching.
+
+    Returns:
+        tuple: Reference poses of shape (T, 24, 3), processing frames per second, number of
+            model calls and whether the result was loaded from the cache.
+    """
+    clip = _clip_identity(video_path)
+    settings = json.dumps({'clip': clip, 'pipeline': _pipeline_settings(config)}, sort_keys=True)
+    cache_path = None
+    if cache_dir:
+        video_base_name = os.path.splitext(os.path.basename(video_path))[0]
+        path_hash = hashlib.sha1(clip['path'].encode('utf-8')).hexdigest()[:10]
+        cache_path = os.path.join(cache_dir, f"{video_base_name}_{path_hash}_{config['name']}.npz")
+        if os.path.exists(cache_path):
+            cached = np.load(cache_path)
+            if str(cached['settings']) == settings:
+                print(f"[Speed Accuracy] Loaded cached reference: {cache_path}")
+                return cached['poses'], float(cached['fps']), int(cached['model_calls']), True
+            print(f"[Speed Accuracy] Cached reference {cache_path} is for a different clip or settings, re-running")
+
+    poses, fps, model_calls = extract_trajectory(processed_video_path, get_model(config['model_type']), config)
+    if cache_path:
+        ensure_directory(cache_dir)
+        np.savez(cache_path, poses=poses, fps=fps, model_calls=model_calls, settings=settings)
+        print(f"[Speed Accuracy] Saved reference to cache: {cache_path}")
+    return poses, fps, model_calls, False
+
+def run_benchmark(video_paths, reference_config=None, candidate_configs=None, cache_dir=None,
+                  model_type_override=None, thresholds=None):
+    """
+    Run the reference and candidate configurations over a set of clips and compare their poses.
+
+    Each clip first goes through check_and_adjust_aspect_ratio, as in the main pipeline, so
+    poses are measured on the same frames that reach the Excel and Kinect CSV outputs.
+
+    Args:
+        video_paths (list): Paths to the input videos.
+        reference_config (dict): Reference configuration; defaults to BENCHMARK_REFERENCE_CONFIG.
+        candidate_configs (list): Candidate configurations; defaults to BENCHMARK_CANDIDATE_CONFIGS.
+        cache_dir (str): Directory for cached reference trajectories, or None to disable caching.
+        model_type_override (str): Model type used for every configuration (e.g. 'stub'), or None.
+        thresholds (dict): Default max_mpjpe, max_jitter_ratio and min_fps for candidates.
+
+    Returns:
+        list: Per clip, a reference row followed by one result row per candidate configuration.
+            reference_cached marks rows whose reference FPS and speedup use a cached timing.
+    """
+    reference_config = resolve_config(reference_config or BENCHMARK_REFERENCE_CONFIG)
+    candidate_configs = [resolve_config(config, reference_config) for config in (candidate_configs or BENCHMARK_CANDIDATE_CONFIGS)]
+    names = [reference_config['name']] + [config['name'] for config in candidate_configs]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"[Speed Accuracy] Duplicate config names: {duplicates}")
+    if thresholds is None:
+        thresholds = {'max_mpjpe': BENCHMARK_MAX_MPJPE, 'max_jitter_ratio': BENCHMARK_MAX_JITTER_RATIO,
+                      'min_fps': BENCHMARK_MIN_FPS}
+    if model_type_override:
+        for config in [reference_config] + candidate_configs:
+            config['model_type'] = model_type_override
+
+    models = {}
+    def get_model(model_type):
+        if model_type not in models:
+            models[model_type] = load_model(model_type)
+        return models[model_type]
+
+    results = []
+    for video_path in video_paths:
+        print(f"[Speed Accuracy] Clip: {video_path}")
+        temp_output_dir = os.path.join(os.path.dirname(video_path), 'temp_videos')
+        processed_video_path = check_and_adjust_aspect_ratio(video_path, temp_output_dir)
+        if not processed_video_path:
+            raise IOError(f"[Speed Accuracy] Failed to process video aspect ratio: {video_path}")
+
+        reference, reference_fps, reference_calls, reference_cached = load_or_run_reference(
+            video_path, processed_video_path, reference_config, get_model, cache_dir)
+        results.append({
+            'clip': os.path.basename(video_path),
+            'config': reference_config['name'],
+            'is_reference': True,
+            'settings': _pipeline_settings(reference_config),
+            'fps': reference_fps,
+            'reference_cached': reference_cached,
+            'model_calls': reference_calls,
+            'frames': len(reference),
+            'jitter': compute_jitter(reference),
+            'failures': [],
+            'passed': True
+        })
+        for config in candidate_configs:
+            print(f"[Speed Accuracy] Running config '{config['name']}'")
+            candidate, fps, model_calls = extract_trajectory(processed_video_path, get_model(config['model_type']), config)
+            result = {
+                'clip': os.path.basename(video_path),
+                'config': config['name'],
+                'is_reference': False,
+                'settings': _pipeline_settings(config),
+                'fps': fps,
+                'reference_cached': reference_cached,
+                'reference_fps': reference_fps,
+                'speedup': fps / reference_fps if reference_fps > 0 else float('nan'),
+                'model_calls': model_calls
+            }
+            result.update(compute_metrics(reference, candidate))
+            result['failures'] = check_thresholds(result, config, thresholds)
+            result['passed'] = not result['failures']
+            results.append(result)
+            print(f"[Speed Accuracy] {config['name']}: FPS {fps:.2f}, MPJPE {result['mpjpe']:.2f} mm, "
+                  f"jitter ratio {result['jitter_ratio']:.2f}, {'PASS' if result['passed'] else 'FAIL'}")
+    return results
+
+def _json_safe(value):
+    if isinstance(value, dict):
+        return {key: _json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(item) for item in value]
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    return value
+
+def format_markdown(results):
+    """
+    Format benchmark results as a Markdown table.
+
+    Args:
+        results (list): Result rows from run_benchmark.
+
+    Returns:
+        str: Markdown table.
+    """
+    lines = [
+        '| Clip | Config | FPS | Speedup | MPJPE (mm) | Root-rel. MPJPE (mm) | Worst joint (mm) | Jitter ratio | Status |',
+        '|---|---|---|---|---|---|---|---|---|'
+    ]
+    for result in results:
+        cached_mark = ' (cached)' if result['reference_cached'] else ''
+        if result['is_reference']:
+            lines.append(f"| {result['clip']} | {result['config']} | {result['fps']:.2f}{cached_mark} | "
+                         f"1.00x | - | - | - | - | reference |")
+            continue
+        per_joint = {joint: error for joint, error in result['per_joint_error'].items() if np.isfinite(error)}
+        worst = max(per_joint, key=per_joint.get) if per_joint else None
+        worst_text = f"{worst} ({per_joint[worst]:.1f})" if worst else '-'
+        jitter_text = f"{result['jitter_ratio']:.2f}" if np.isfinite(result['jitter_ratio']) else 'n/a'
+        status = 'PASS' if result['passed'] else 'FAIL: ' + '; '.join(result['failures'])
+        lines.append(f"| {result['clip']} | {result['config']} | {result['fps']:.2f} | {result['speedup']:.2f}x{cached_mark} | "
+                     f"{result['mpjpe']:.2f} | {result['root_relative_mpjpe']:.2f} | {worst_text} | "
+                     f"{jitter_text} | {status} |")
+    if any(result['reference_cached'] for result in results):
+        lines.append('')
+        lines.append('Note: (cached) marks a reference FPS loaded from the cache, and speedups computed from it; '
+                     'it may come from an earlier run or another machine. Use --no-cache to re-time the reference.')
+    if any(not result['is_reference'] and not np.isfinite(result['jitter_ratio']) for result in results):
+        lines.append('')
+        lines.append(f'Note: jitter ratio is n/a where the reference jitter is below {BENCHMARK_MIN_REFERENCE_JITTER} mm/frame^2 or undefined; '
+                     'the jitter check is skipped there.')
+    return '\n'.join(lines) + '\n'
+
+def save_report(results, output_dir):
+    """
+    Save benchmark results as JSON and Markdown.
+
+    Args:
+        results (list): Result rows from run_benchmark.
+        output_dir (str): Directory to save the report files.
+
+    Returns:
+        tuple: Paths to the JSON and Markdown reports.
+    """
+    ensure_directory(output_dir)
+    json_path = os.path.join(output_dir, 'speed_accuracy.json')
+    markdown_path = os.path.join(output_dir, 'speed_accuracy.md')
+    with open(json_path, 'w') as f:
+        json.dump(_json_safe(results), f, indent=2)
+    with open(markdown_path, 'w') as f:
+        f.write(format_markdown(results))
+    print(f"[Speed Accuracy] Saved reports to: {json_path}, {markdown_path}")
+    return json_path, markdown_path
+
+def main(argv=None):
+    """
+    Command-line entry point; exits with status 1 if any candidate fails its thresholds.
+    """
+    parser = argparse.ArgumentParser(description='Compare fast processing modes against a reference configuration.')
+    parser.add_argument('videos', nargs='+', help='Input video clips')
+    parser.add_argument('--configs', help='JSON file with "reference" and/or "candidates" configurations')
+    parser.add_argument('--output-dir', default='output/Benchmarks', help='Directory for the JSON and Markdown reports')
+    parser.add_argument('--cache-dir', default='output/Benchmarks/reference_cache', help='Directory for cached reference trajectories')
+    parser.add_argument('--no-cache', action='store_true', help='Always re-run the reference configuration')
+    parser.add_argument('--stub', action='store_true', help='Use the deterministic stub model for every configuration')
+    parser.add_argument('--max-mpjpe', type=float, default=BENCHMARK_MAX_MPJPE, help='Default MPJPE threshold in mm')
+    parser.add_argument('--max-jitter-ratio', type=float, default=BENCHMARK_MAX_JITTER_RATIO, help='Default jitter ratio threshold')
+    parser.add_argument('--min-fps', type=float, default=BENCHMARK_MIN_FPS, help='Default minimum frames per second')
+    args = parser.parse_args(argv)
+
+    reference_config = None
+    candidate_configs = None
+    if args.configs:
+        with open(args.configs) as f:
+            configs = json.load(f)
+        reference_config = configs.get('reference')
+        candidate_configs = configs.get('candidates')
+
+    results = run_benchmark(
+        args.videos, reference_config, candidate_configs,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        model_type_override=STUB_MODEL_TYPE if args.stub else None,
+        thresholds={'max_mpjpe': args.max_mpjpe, 'max_jitter_ratio': args.max_jitter_ratio, 'min_fps': args.min_fps}
+    )
+    save_report(results, args.output_dir)
+    print(format_markdown(results))
+
+    candidates = [result for result in results if not result['is_reference']]
+    failed = [result for result in candidates if not result['passed']]
+    if failed:
+        print(f"[Speed Accuracy] {len(failed)} of {len(candidates)} runs failed their thresholds")
+        sys.exit(1)
+    print("[Speed Accuracy] All runs passed")
+
+if __name__ == "__main__":
+    main()
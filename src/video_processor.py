@@ -5,24 +5,26 @@ import os
 import shutil
 from tqdm import tqdm
 from src.visualization import visualize_frame
+from src.image_writer import ImageWriter
 from utils.file_utils import ensure_directory
 from utils.config import SMPL24_JOINT_NAMES
 
-def create_video_from_frames(image_dir, output_video_path, fps, original_width, original_height):
+def create_video_from_frames(image_dir, output_video_path, fps, original_width, original_height, extension='.png'):
     """
     Create a video from saved images in a directory.
     
     Args:
-        image_dir (str): Directory containing PNG images.
+        image_dir (str): Directory containing the frame images.
         output_video_path (str): Path to save the output video.
         fps (float): Frames per second for the output video.
         original_width (int): Width of the output video.
         original_height (int): Height of the output video.
+        extension (str): File extension of the frame images to use.
     """
     print(f"[Video Processor] Creating video from: {image_dir}")
     
     # Get list of image files sorted by name
-    images = sorted([img for img in os.listdir(image_dir) if img.endswith('.png')])
+    images = sorted([img for img in os.listdir(image_dir) if img.endswith(extension)])
     if not images:
         print(f"[Video Processor] No images found in {image_dir}")
         return
@@ -83,7 +85,9 @@ def process_single_video(video_path, output_excel_path, output_2d_dir, output_3d
     frame_number = 0
     print("[Video Processor] Starting frame processing...")
     
-    with tqdm(total=total_frames, desc="Processing Frames", unit="frame") as pbar:
+    # Images are encoded and written in the background; leaving the with block flushes them
+    image_writer = ImageWriter({'2d': output_2d_dir, '3d': output_3d_dir, 'comparison': output_comparison_dir})
+    with image_writer, tqdm(total=total_frames, desc="Processing Frames", unit="frame") as pbar:
         while cap.isOpened():
             ret, frame = cap.read()
             if not ret:
@@ -99,7 +103,7 @@ def process_single_video(video_path, output_excel_path, output_2d_dir, output_3d
             poses2d = pred['poses2d'].numpy()
             edges = model.per_skeleton_joint_edges['smpl_24'].numpy()
             
-            visualize_frame(frame, poses3d, poses2d, edges, frame_number, output_2d_dir, output_3d_dir, output_comparison_dir, original_width, original_height)
+            visualize_frame(frame, poses3d, poses2d, edges, frame_number, image_writer, original_width, original_height)
             
             for pose_idx, pose3d in enumerate(poses3d):
                 pose_data = pose3d.flatten()
@@ -115,8 +119,8 @@ def process_single_video(video_path, output_excel_path, output_2d_dir, output_3d
     video_base_name = os.path.splitext(video_name)[0]
     video_2d_path = os.path.join(output_videos_dir, f'{video_base_name}_2D.mp4')
     video_3d_path = os.path.join(output_videos_dir, f'{video_base_name}_3D.mp4')
-    create_video_from_frames(output_2d_dir, video_2d_path, fps, original_width, original_height)
-    create_video_from_frames(output_3d_dir, video_3d_path, fps, original_width, original_height)
+    create_video_from_frames(output_2d_dir, video_2d_path, image_writer.get_fps('2d', fps), original_width, original_height, image_writer.extension)
+    create_video_from_frames(output_3d_dir, video_3d_path, image_writer.get_fps('3d', fps), original_width, original_height, image_writer.extension)
     
     # Copy processed video
     original_video_copy_path = os.path.join(output_videos_dir, video_name)
@@ -44,4 +44,61 @@ JOINT_MAPPING = {
     "Right_Wrist_21": 14,
     "Left_Hand_22": 8,
     "Right_Hand_23": 15
-}
\ No newline at end of file
+}
+
+# Output format for per-frame visualization images: 'png', 'jpg' or 'webp'
+IMAGE_FORMAT = 'png'
+
+# PNG compression level (0 = fastest/largest, 9 = slowest/smallest)
+PNG_COMPRESSION = 3
+
+# JPEG quality (0-100)
+JPEG_QUALITY = 90
+
+# WebP quality (1-100)
+WEBP_QUALITY = 90
+
+# Write only every Nth frame for each image kind (1 = every frame)
+IMAGE_DECIMATION = {
+    '2d': 1,
+    '3d': 1,
+    'comparison': 1
+}
+
+# Number of background threads encoding and writing images
+IMAGE_WRITER_WORKERS = 4
+
+# Maximum number of images queued for writing before the processing loop blocks
+IMAGE_WRITER_MAX_PENDING = 16
+
+
+# Pipeline configuration used as ground truth by the speed/accuracy harness.
+# input_scale resizes frames before inference, frame_stride runs the model on every Nth
+# frame and interpolates the rest, batch_size groups frames into one batched call and
+# redetect_interval runs the person detector every Nth inferred frame, reusing the
+# previous box as a tracking crop in between.
+BENCHMARK_REFERENCE_CONFIG = {
+    'name': 'reference',
+    'model_type': MODEL_TYPE,
+    'input_scale': 1.0,
+    'frame_stride': 1,
+    'batch_size': 1,
+    'redetect_interval': 1
+}
+
+# Candidate fast-processing configurations compared against the reference.
+# Thresholds are optional: max_mpjpe (mm), max_jitter_ratio (candidate / reference) and min_fps.
+BENCHMARK_CANDIDATE_CONFIGS = [
+    {'name': 'half_resolution', 'input_scale': 0.5, 'max_mpjpe': 30.0},
+    {'name': 'stride_2', 'frame_stride': 2, 'max_mpjpe': 20.0},
+    {'name': 'batched_8', 'batch_size': 8, 'max_mpjpe': 1.0},
+    {'name': 'tracking_crops', 'redetect_interval': 10, 'max_mpjpe': 20.0}
+]
+
+# Default thresholds applied to candidates that do not set their own (None disables a check)
+BENCHMARK_MAX_MPJPE = 50.0
+BENCHMARK_MAX_JITTER_RATIO = 2.0
+BENCHMARK_MIN_FPS = None
+
+# Below this reference jitter (mm/frame^2) the clip is treated as static and the jitter check is skipped
+BENCHMARK_MIN_REFERENCE_JITTER = 1.0